@@ -1,6 +1,11 @@
 """Tests for conversion module."""
 import unittest
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 import util.conversion
 
 
@@ -46,6 +51,43 @@ class TestInvalidTypes(TestBaseConversion):
                                       'TypeError was not raised on invalid type argument')
 
 
+    def test_invalid_euro_cents(self):
+        """Test conversions to euro cents on invalid type amounts"""
+        data_set = [
+            150000000.0,
+            1.5,
+            True,
+            [2789]
+        ]
+        conversion_functions = [
+            util.conversion.btc_to_euro_cents,
+            util.conversion.eth_to_euro_cents,
+            util.conversion.xlm_to_euro_cents,
+            util.conversion.bul_to_euro_cents
+        ]
+        for invalid_type_value in data_set:
+            for conversion_function in conversion_functions:
+                with self.subTest(value=invalid_type_value, function=conversion_function.__name__):
+                    with self.assertRaises(TypeError, msg='TypeError was not raised on invalid type amount'):
+                        conversion_function(invalid_type_value, '1.00')
+
+
+class TestInvalidValues(TestBaseConversion):
+    """Test conversion functions on malformed amounts"""
+
+    def test_multiple_decimal_points(self):
+        """Test conversion functions on amounts with more than one decimal point"""
+        conversion_functions = [
+            util.conversion.btc_to_satoshi,
+            util.conversion.eth_to_wei,
+            util.conversion.units_to_stroops
+        ]
+        for conversion_function in conversion_functions:
+            with self.subTest(function=conversion_function.__name__):
+                with self.assertRaises(ValueError, msg='ValueError was not raised on amount with two decimal points'):
+                    conversion_function('1.12345678.9')
+
+
 class TestBtcConversion(TestBaseConversion):
     """Test btc conversion"""
 
@@ -128,6 +170,8 @@ class TestStellarConversion(TestBaseConversion):
             '1792.0045': 17920045000,
             '187398743124.8795178': 1873987431248795178,
             '1792.0045126789125479': 17920045126,
+            '-1.5': -15000000,
+            '-0.0000001': -1,
         }
         self.conversion(data_set, util.conversion.units_to_stroops,
                         message='stellar units to stroops conversion failed')
@@ -148,11 +192,25 @@ class TestStellarConversion(TestBaseConversion):
             1745127942: '174.5127942',
             '1745127942': '174.5127942',
             1873987431248795178: '187398743124.8795178',
-            '1873987431248795178': '187398743124.8795178'
+            '1873987431248795178': '187398743124.8795178',
+            -15000000: '-1.5',
+            '-15000000': '-1.5',
+            -1: '-0.0000001'
         }
         self.conversion(data_set, util.conversion.stroops_to_units,
                         message='stroops to stellar units conversion failed')
 
+    def test_stroops_to_numeric_units(self):
+        """Test stroops to stellar units conversion with numeric representation"""
+        data_set = {
+            1: 0.0000001,
+            '5600': 0.00056,
+            50000000: 5.0,
+            1745127942: 174.5127942
+        }
+        self.conversion(data_set, lambda amount: util.conversion.stroops_to_units(amount, numeric_representation=True),
+                        message='stroops to numeric stellar units conversion failed')
+
 
 class EuroToBulStellarConversion(unittest.TestCase):
     """Test conversion from euro cents to BUL stroops."""
@@ -190,7 +248,103 @@ class EuroToBulStellarConversion(unittest.TestCase):
             {
                 'price': '10',
                 'euro_cent_amount': 1000,
-                'expected': 10000000}
+                'expected': 10000000},
+            {
+                'price': '0.' + '1' * 57,
+                'euro_cent_amount': 100,
+                'expected': 90000000}
         ]
         self.euro_to_stellar(data_set, util.conversion.euro_cents_to_xlm_stroops,
                              "{} XLM stroops expected, {} got instead")
+
+
+class CurrencyToEuroCentsConversion(unittest.TestCase):
+    """Test conversion from crypto currencies to euro cents."""
+
+    def currency_to_euro_cents(self, data_set, conversion_function, msg):
+        """Test conversion from indivisible units of crypto currency to euro cents."""
+        for data in data_set:
+            with self.subTest(price=data['price'], amount=data['amount'], expected=data['expected']):
+                euro_cents = conversion_function(data['amount'], data['price'])
+                self.assertEqual(euro_cents, data['expected'], msg.format(data['expected'], euro_cents))
+
+    def test_btc_to_euro_cents(self):
+        """Test conversion from BTC satoshi to euro cents, including rounding half to even."""
+        data_set = [
+            {'price': '3500.12', 'amount': 100000000, 'expected': 350012},
+            {'price': '1.00', 'amount': 500000, 'expected': 0},
+            {'price': '1.00', 'amount': 1500000, 'expected': 2},
+            {'price': '1.00', 'amount': 2500000, 'expected': 2},
+            {'price': '1.00', 'amount': 2500001, 'expected': 3}]
+        self.currency_to_euro_cents(data_set, util.conversion.btc_to_euro_cents,
+                                    "{} euro cents expected, {} got instead")
+
+    def test_eth_to_euro_cents(self):
+        """Test conversion from ETH wei to euro cents."""
+        data_set = [
+            {'price': '170.55', 'amount': 1000000000000000000, 'expected': 17055},
+            {'price': '1.00', 'amount': 5000000000000000, 'expected': 0}]
+        self.currency_to_euro_cents(data_set, util.conversion.eth_to_euro_cents,
+                                    "{} euro cents expected, {} got instead")
+
+    def test_currency_to_euro_cents_exact(self):
+        """Test conversion to euro cents when no rounding is needed."""
+        data_set = [
+            {'price': '1.23', 'amount': 3, 'decimals': 0, 'expected': 369},
+            {'price': '1.1', 'amount': 5, 'decimals': 1, 'expected': 55},
+            {'price': '2', 'amount': 5, 'decimals': 0, 'expected': 1000}]
+        for data in data_set:
+            with self.subTest(price=data['price'], amount=data['amount'], decimals=data['decimals']):
+                self.assertEqual(util.conversion.currency_to_euro_cents(
+                    data['amount'], data['price'], data['decimals']), data['expected'])
+
+    def test_long_price_to_euro_cents(self):
+        """Test conversion to euro cents with more price decimals than precomputed powers of ten."""
+        long_price = '0.' + '1' * 48
+        self.assertEqual(util.conversion.eth_to_euro_cents(1, long_price), 0)
+        self.assertEqual(util.conversion.eth_to_euro_cents(1000000000000000000, long_price), 11)
+
+    def test_xlm_to_euro_cents(self):
+        """Test conversion from XLM stroops to euro cents."""
+        data_set = [
+            {'price': '0.2', 'amount': 10000000, 'expected': 20},
+            {'price': '0.23', 'amount': 12345678, 'expected': 28},
+            {'price': '10', 'amount': 10000000, 'expected': 1000}]
+        self.currency_to_euro_cents(data_set, util.conversion.xlm_to_euro_cents,
+                                    "{} euro cents expected, {} got instead")
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class ArrayConversion(unittest.TestCase):
+    """Test array conversions against their scalar counterparts."""
+
+    def test_currency_array_to_euro_cents(self):
+        """Test conversion of arrays of indivisible units to euro cents."""
+        data_set = [
+            {'price': '1.00', 'decimals': util.conversion.BTC_DECIMALS,
+             'amounts': [100000000, 500000, 1500000, 2500000, 2500001]},
+            {'price': '170.55', 'decimals': util.conversion.ETH_DECIMALS,
+             'amounts': [1000000000000000000, 5000000000000000, 15000000000000000]},
+            {'price': '1.23', 'decimals': 0, 'amounts': [3, 4, 5]},
+            {'price': '2', 'decimals': 0, 'amounts': [5, 7]}]
+        for data in data_set:
+            with self.subTest(price=data['price'], decimals=data['decimals']):
+                euro_cents = util.conversion.currency_array_to_euro_cents(
+                    numpy.array(data['amounts']), data['price'], data['decimals'])
+                self.assertEqual(euro_cents.tolist(), [
+                    util.conversion.currency_to_euro_cents(amount, data['price'], data['decimals'])
+                    for amount in data['amounts']])
+
+    def test_invalid_array_to_euro_cents(self):
+        """Test conversion of non-integer arrays to euro cents."""
+        for amounts in [numpy.array([1.5, 2.5]), numpy.array([True, False]), numpy.array([1, 2.5], dtype=object)]:
+            with self.subTest(amounts=amounts):
+                with self.assertRaises(TypeError, msg='TypeError was not raised on non-integer array'):
+                    util.conversion.currency_array_to_euro_cents(amounts, '1.00', 0)
+
+    def test_amounts_to_stroops_array(self):
+        """Test conversion of arrays of stellar units to stroops."""
+        for amounts in [[0, 1, 45], ['0.0000001', '174.5127942', '45']]:
+            with self.subTest(amounts=amounts):
+                stroops = util.conversion.amounts_to_stroops_array(numpy.array(amounts))
+                self.assertEqual(stroops.tolist(), [util.conversion.units_to_stroops(amount) for amount in amounts])
@@ -1,4 +1,5 @@
 """Tests for db module."""
+import contextlib
 import os
 import unittest
 
@@ -42,15 +43,39 @@ class TestDB(unittest.TestCase):
             self.assertNotEqual(result, None)
             self.assertEqual(result[0]['number'], 144)
 
+    def test_clear_tables(self):
+        """Test clearing all tables in the database"""
+        LOGGER.info('creating and filling new tables')
+        with self.sql() as sql:
+            sql.execute('CREATE TABLE parent(id INTEGER PRIMARY KEY)')
+            sql.execute('''
+                CREATE TABLE child(id INTEGER, parent_id INTEGER, FOREIGN KEY (parent_id) REFERENCES parent(id))''')
+            sql.execute('INSERT INTO parent (id) VALUES (1)')
+            sql.execute('INSERT INTO child (id, parent_id) VALUES (1, 1)')
+        LOGGER.info('clearing tables')
+        util.db.clear_tables(self.sql, DB_NAME)
+        with self.sql() as sql:
+            for table_name in ('parent', 'child'):
+                sql.execute('SELECT COUNT(*) AS count FROM {}'.format(table_name))
+                self.assertEqual(sql.fetchone()['count'], 0, "table {} was not cleared".format(table_name))
+
+    def test_pool_exhausted(self):
+        """Test nesting more connections than the pool holds"""
+        LOGGER.info('opening more nested connections than pool size')
+        with contextlib.ExitStack() as stack:
+            cursors = [stack.enter_context(self.sql()) for _ in range(util.db.POOL_SIZE + 1)]
+            for sql in cursors:
+                sql.execute('SELECT DATABASE() AS db_name')
+                self.assertEqual(sql.fetchone()['db_name'], DB_NAME)
+
     def test_closing(self):
         """Test closing connection"""
         LOGGER.info('creating new table')
         with self.sql() as sql:
             sql.execute('DROP TABLE IF EXISTS test')
             sql.execute('CREATE TABLE test(id INTEGER UNIQUE, number INTEGER)')
-        LOGGER.info('attempting operation after closing connection')
-        with self.assertRaises(ReferenceError):
-            sql.fetchone()
+        LOGGER.info('checking that cursor was closed')
+        self.assertFalse(sql.close(), 'cursor was not closed')
 
     def test_closing_on_exception(self):
         """Test closing connection on exception"""
@@ -66,6 +91,5 @@ class TestDB(unittest.TestCase):
             pass  # ignore raised Exception
         # pylint: enable=broad-except
         finally:
-            LOGGER.info('attempting operation after raising exception')
-            with self.assertRaises(ReferenceError):
-                sql.fetchone()
+            LOGGER.info('checking that cursor was closed after raising exception')
+            self.assertFalse(sql.close(), 'cursor was not closed')
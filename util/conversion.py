@@ -1,13 +1,44 @@
 """Bitcoin, ethereum, stellar units handling. Conversions to and from fiat currencies."""
-import util.logger
+import functools
+import logging
 
 # number of decimals after decimal point in currencies
 ETH_DECIMALS = 18
 BTC_DECIMALS = 8
 STELLAR_DECIMALS = 7
 DECIMAL_POINT = '.'
+# powers of ten, indexed by number of decimals
+_POW10 = tuple(10 ** power for power in range(64))
+_XLM_POW = _POW10[STELLAR_DECIMALS]
+_BTC_POW = _POW10[BTC_DECIMALS]
+_ETH_POW = _POW10[ETH_DECIMALS]
+_INT64_MAX = 2 ** 63 - 1
 
-LOGGER = util.logger.logging.getLogger('pkt.util.currency_conversions')
+LOGGER = logging.getLogger('pkt.util.currency_conversions')
+
+
+def _pow10(decimals):
+    """
+    Get power of ten from the precomputed table, computing it for decimals past the table.
+    :param int decimals: Number of decimals
+    :return int: Ten to the power of decimals
+    """
+    return _POW10[decimals] if decimals < len(_POW10) else 10 ** decimals
+
+
+def _amount_type(amount):
+    """
+    Get type of amount to be converted.
+    :param str or int amount: Amount to be converted
+    :return type: Type of amount
+    :raises TypeError: If amount is neither string nor integer
+    """
+    amount_type = type(amount)
+    # exact types are checked first, subclasses (except bool) are still allowed
+    if amount_type is not int and amount_type is not str and (
+            not isinstance(amount, (str, int)) or isinstance(amount, bool)):
+        raise TypeError('Only string and integer allowed for conversions')
+    return amount_type
 
 
 def divisible_to_indivisible(amount, decimals):
@@ -17,26 +48,16 @@ def divisible_to_indivisible(amount, decimals):
     :param int decimals: Number of decimals in convertible currency
     :return int: Amount of indivisible units
     """
-    if not isinstance(amount, str) and not (isinstance(amount, int) and not isinstance(amount, bool)):
-        raise TypeError('Only string and integer allowed for conversions')
+    amount_type = _amount_type(amount)
 
-    amount = str(amount)
-    if DECIMAL_POINT in amount:
-        integer_part, fractional_part = amount.split(DECIMAL_POINT)
-        fractional_part = fractional_part[:decimals]
-    else:
-        integer_part, fractional_part = amount, '0' * decimals
-
-    if integer_part != '0':
-        amount = "{0}{1:<0{decimals}}".format(integer_part, fractional_part, decimals=decimals)
-    else:
-        striped = fractional_part.lstrip('0')
-        leading_zeros_amount = len(fractional_part) - len(striped)
-        trailing_zeros_amount = decimals - leading_zeros_amount - len(striped)
-        amount = "{0}{1}".format(striped, '0' * trailing_zeros_amount)
+    if amount_type is int:
+        return amount * _pow10(decimals)
 
-    amount = amount or '0'
-    return int(amount)
+    integer_part, _, fractional_part = str(amount).partition(DECIMAL_POINT)
+    if DECIMAL_POINT in fractional_part:
+        raise ValueError('Only one decimal point allowed in amount')
+    # with fractional part padded to exact number of decimals, int() handles sign and leading zeros itself
+    return int(integer_part + fractional_part[:decimals].ljust(decimals, '0') or 0)
 
 
 def indivisible_to_divisible(amount, decimals):
@@ -46,26 +67,41 @@ def indivisible_to_divisible(amount, decimals):
     :param int decimals: Number of decimals in convertible currency
     :return str: Amount of divisible units
     """
-    if not isinstance(amount, str) and not (isinstance(amount, int) and not isinstance(amount, bool)):
-        raise TypeError('Only string and integer allowed for conversions')
+    amount_type = _amount_type(amount)
+
+    if amount_type is not int:
+        amount = int(amount)
+    # divmod floors, so split the absolute value and restore the sign afterwards
+    integer_part, fractional_part = divmod(abs(amount), _pow10(decimals))
+    return ('-' if amount < 0 else '') + _int_to_fixed(integer_part, fractional_part, decimals)
 
-    amount = str(amount)
-    amount = "{}.{}".format(amount[:-decimals], amount[-decimals:]) if len(amount) > decimals else \
-        "0.{amount:0>{decimals}}".format(amount=amount, decimals=decimals)
-    integer_part, fractional_part = amount.split('.')
-    striped = fractional_part.rstrip('0')
-    amount = "{}.{}".format(integer_part, striped or '0')
 
-    return amount
+def _int_to_fixed(integer_part, fractional_part, decimals):
+    """
+    Format integer and fractional parts of amount as fixed-point string.
+    :param int integer_part: Integer part of amount
+    :param int fractional_part: Fractional part of amount, in indivisible units
+    :param int decimals: Number of decimals in convertible currency
+    :return str: Amount of divisible units
+    """
+    if not fractional_part:
+        return "{}.0".format(integer_part)
+    # strip trailing zeros arithmetically, so the string is built only once
+    while not fractional_part % 10:
+        fractional_part //= 10
+        decimals -= 1
+    return "{}.{}".format(integer_part, str(fractional_part).zfill(decimals))
 
 
-def stroops_to_units(amount):
+def stroops_to_units(amount, numeric_representation=False):
     """
     Convert amount presented in stroops to units.
     :param str or int amount: Amount of stroops to be converted
-    :return str: Amount of stellar units
+    :param bool numeric_representation: Return amount as float instead of string
+    :return str or float: Amount of stellar units
     """
-    return indivisible_to_divisible(amount, STELLAR_DECIMALS)
+    units = indivisible_to_divisible(amount, STELLAR_DECIMALS)
+    return float(units) if numeric_representation else units
 
 
 def units_to_stroops(amount):
@@ -74,9 +110,26 @@ def units_to_stroops(amount):
     :param str or int amount: Amount of units to be converted
     :return int: Amount of stroops
     """
+    if type(amount) is int:  # pylint: disable=unidiomatic-typecheck
+        return amount * _XLM_POW
     return divisible_to_indivisible(amount, STELLAR_DECIMALS)
 
 
+def amounts_to_stroops_array(amounts):
+    """
+    Convert array of stellar units to stroops.
+    :param numpy.ndarray amounts: Amounts of units to be converted
+    :return numpy.ndarray: Amounts of stroops
+    """
+    stroops = amounts.astype(object)
+    if amounts.dtype.kind in 'iu':
+        return stroops * _XLM_POW
+    flat_stroops = stroops.reshape(-1)
+    for index, amount in enumerate(flat_stroops):
+        flat_stroops[index] = units_to_stroops(amount)
+    return stroops
+
+
 def wei_to_eth(amount):
     """
     Convert wei to ethereum
@@ -92,6 +145,8 @@ def eth_to_wei(amount):
     :param str or int amount: Amount of ethereum to be converted
     :return int: Amount of wei
     """
+    if type(amount) is int:  # pylint: disable=unidiomatic-typecheck
+        return amount * _ETH_POW
     return divisible_to_indivisible(amount, ETH_DECIMALS)
 
 
@@ -110,9 +165,34 @@ def btc_to_satoshi(amount):
     :param amount: Amount of bitcoin to be converted
     :return int: Amount of satoshi
     """
+    if type(amount) is int:  # pylint: disable=unidiomatic-typecheck
+        return amount * _BTC_POW
     return divisible_to_indivisible(amount, BTC_DECIMALS)
 
 
+@functools.lru_cache(maxsize=1024)
+def _price_to_fictitious(eur_price):
+    """
+    Parse EUR price into fictitious units (portions of euro cents).
+    :param str eur_price: price in EUR by one divisible unit of some currency
+    :return tuple: price in fictitious units and number of decimals in price
+    """
+    _, decimal_point, fractional_part = eur_price.rpartition(DECIMAL_POINT)
+    price_decimals = len(fractional_part) if decimal_point else 0
+    return divisible_to_indivisible(eur_price, price_decimals), price_decimals
+
+
+@functools.lru_cache(maxsize=1024)
+def _price_to_fictitious_cents(eur_price):
+    """
+    Parse EUR price into fictitious units of euro cents.
+    :param str eur_price: price in EUR by one divisible unit of some currency
+    :return tuple: price in fictitious units and number of decimals in price
+    """
+    fictitious_units_price, price_decimals = _price_to_fictitious(eur_price)
+    return fictitious_units_price * 100, price_decimals
+
+
 def currency_to_euro_cents(amount, eur_price, decimals):
     """
     Convert amount of coins of some currency to euro cents.
@@ -122,15 +202,63 @@ def currency_to_euro_cents(amount, eur_price, decimals):
     :param decimals: number of decimals in one divisible unit of some currency
     :return: amount of EUR cents
     """
-    price_decimals = len(eur_price.split('.')[1])
+    if _amount_type(amount) is not int:
+        amount = int(amount)
     # price in fictitious units (portions of euro cents) by one indivisible unit of specified crypto currency
-    fictitious_units_price = divisible_to_indivisible(eur_price, price_decimals)
+    fictitious_units_price, price_decimals = _price_to_fictitious(str(eur_price))
     fictitious_units_amount = fictitious_units_price * amount
     # minus two because initial price was in EUR and we want euro cents
-    euro_cents = indivisible_to_divisible(fictitious_units_amount, price_decimals + decimals - 2)
-    LOGGER.warning("precision loss: %s converted to %s", euro_cents, round(float(euro_cents)))
-    # integer part of result will be amount of euro cents
-    return round(float(euro_cents))
+    shift = price_decimals + decimals - 2
+    if shift <= 0:
+        # fictitious units are whole euro cents or coarser, so the result is exact
+        return fictitious_units_amount * _pow10(-shift)
+    divisor = _pow10(shift)
+    euro_cents, remainder = divmod(fictitious_units_amount, divisor)
+    # round half to even, same as built-in round
+    half = divisor >> 1
+    if remainder > half or (remainder == half and euro_cents & 1):
+        euro_cents += 1
+    if LOGGER.isEnabledFor(logging.WARNING):
+        LOGGER.warning("precision loss: %s converted to %s",
+                       indivisible_to_divisible(fictitious_units_amount, shift), euro_cents)
+    return euro_cents
+
+
+def currency_array_to_euro_cents(amounts, eur_price, decimals):
+    """
+    Convert array of amounts of some currency to euro cents.
+    Same as currency_to_euro_cents, but the price is parsed once and the math is done by numpy.
+    :param numpy.ndarray amounts: amounts of indivisible units of some currency
+    :param eur_price: price in EUR by one divisible unit of some currency
+    :param decimals: number of decimals in one divisible unit of some currency
+    :return numpy.ndarray: amounts of EUR cents
+    """
+    # object arrays are allowed only when every element is an exact integer, e.g. ETH wei beyond int64
+    exact_integers = amounts.dtype.kind == 'O' and all(
+        type(amount) is int for amount in amounts.flat)  # pylint: disable=unidiomatic-typecheck
+    if amounts.dtype.kind not in 'iu' and not exact_integers:
+        raise TypeError('Only integer arrays allowed for conversions')
+    fictitious_units_price, price_decimals = _price_to_fictitious(str(eur_price))
+    shift = price_decimals + decimals - 2
+    if shift > 0:
+        divisor = _pow10(shift)
+    else:
+        # fictitious units are whole euro cents or coarser, so the result is exact
+        fictitious_units_price, divisor = fictitious_units_price * _pow10(-shift), 1
+    if amounts.dtype.kind in 'iu' and amounts.size and max(
+            fictitious_units_price, divisor,
+            max(-int(amounts.min()), int(amounts.max())) * fictitious_units_price) <= _INT64_MAX:
+        amounts = amounts.astype('int64')
+    else:
+        # amounts may not fit into int64 (ETH wei do not), use python integers
+        amounts = amounts.astype(object)
+    fictitious_units_amounts = amounts * fictitious_units_price
+    if divisor == 1:
+        return fictitious_units_amounts
+    euro_cents, remainder = fictitious_units_amounts // divisor, fictitious_units_amounts % divisor
+    # round half to even, same as currency_to_euro_cents
+    half = divisor >> 1
+    return euro_cents + ((remainder > half) | ((remainder == half) & (euro_cents % 2 == 1)))
 
 
 def btc_to_euro_cents(amount, eur_price):
@@ -185,14 +313,12 @@ def euro_cents_to_xlm_stroops(euro_cents_amount, xlm_price):
     :param xlm_price: EUR price of one XLM
     :return: amount of XLM stroops
     """
-    try:
-        price_decimals = len(xlm_price.split('.')[1])
-    except IndexError:
-        price_decimals = 0
+    fictitious_units_price, price_decimals = _price_to_fictitious_cents(str(xlm_price))
     fictitious_units_amount = divisible_to_indivisible(euro_cents_amount, STELLAR_DECIMALS + price_decimals)
-    fictitious_units_price = divisible_to_indivisible(xlm_price, price_decimals + 2)
     stroops = fictitious_units_amount // fictitious_units_price
-    LOGGER.warning("possible precision loss: %s / %s = %s", fictitious_units_amount, fictitious_units_price, stroops)
+    if LOGGER.isEnabledFor(logging.WARNING):
+        LOGGER.warning(
+            "possible precision loss: %s / %s = %s", fictitious_units_amount, fictitious_units_price, stroops)
     return stroops
 
 
@@ -204,12 +330,10 @@ def euro_cents_to_bul_stroops(euro_cents_amount, bul_price):
     :param bul_price: EUR price of one BUL
     :return:
     """
-    try:
-        price_decimals = len(bul_price.split('.')[1])
-    except IndexError:
-        price_decimals = 0
+    fictitious_units_price, price_decimals = _price_to_fictitious_cents(str(bul_price))
     fictitious_units_amount = divisible_to_indivisible(euro_cents_amount, STELLAR_DECIMALS + price_decimals)
-    fictitious_units_price = divisible_to_indivisible(bul_price, price_decimals + 2)
     stroops = fictitious_units_amount // fictitious_units_price
-    LOGGER.warning("possible precision loss: %s / %s = %s", fictitious_units_amount, fictitious_units_price, stroops)
+    if LOGGER.isEnabledFor(logging.WARNING):
+        LOGGER.warning(
+            "possible precision loss: %s / %s = %s", fictitious_units_amount, fictitious_units_price, stroops)
     return stroops
@@ -1,32 +1,83 @@
 """Database utils."""
 import contextlib
 import functools
+import os
 import re
 
 import mysql.connector
+import mysql.connector.pooling
+
+POOL_SIZE = int(os.environ.get('PAKET_DB_POOL_SIZE', 5))
+# connection pools, keyed by (host, port, user, password, db_name)
+_POOLS = {}
 
 
 class DataTooBig(Exception):
     """Data too big for database column."""
 
 
+def _get_pool(db_name=None, host=None, port=3306, user=None, password=None):
+    """Get the connection pool for the database, creating it on first use."""
+    # password is part of the key, so a different password never gets an already authenticated connection
+    key = (host, port, user, password, db_name)
+    if key not in _POOLS:
+        _POOLS[key] = mysql.connector.pooling.MySQLConnectionPool(
+            pool_name="pkt.{}".format(len(_POOLS)), pool_size=POOL_SIZE,
+            host=host, port=port, user=user, passwd=password, database=db_name,
+            # Unread results must not block closing the cursor and returning the connection to the pool.
+            consume_results=True)
+    return _POOLS[key]
+
+
+def _get_connection(db_name=None, host=None, port=3306, user=None, password=None):
+    """Get a connection from the pool, or a new connection if the pool is exhausted."""
+    try:
+        connection = _get_pool(db_name, host, port, user, password).get_connection()
+    except mysql.connector.PoolError:
+        return mysql.connector.connect(
+            host=host, port=port, user=user, passwd=password, database=db_name, consume_results=True)
+    if db_name is not None:
+        # The database may have been dropped while the connection was in the pool, leaving it with none selected.
+        try:
+            connection.cmd_init_db(db_name)
+        except mysql.connector.Error:
+            connection.close()
+            raise
+    return connection
+
+
 @contextlib.contextmanager
-def sql_connection(db_name=None, host=None, port=3306, user=None, password=None):
-    """Context manager for querying the database."""
+def sql_connection(db_name=None, host=None, port=3306, user=None, password=None, *, dictionary=True):
+    # pylint: disable=too-many-arguments
+    """Context manager for querying the database, rows are fetched as dicts unless dictionary is False."""
+    connection = _get_connection(db_name, host, port, user, password)
     try:
-        connection = mysql.connector.connect(host=host, port=port, user=user, passwd=password, database=db_name)
-        yield connection.cursor(dictionary=True)
+        cursor = connection.cursor(dictionary=dictionary)
+        yield cursor
         connection.commit()
     except mysql.connector.DataError as data_error:
+        _rollback(connection)
         check_data_error(data_error)
-    except mysql.connector.Error as db_error:
-        raise db_error
+    except Exception:
+        _rollback(connection)
+        raise
     finally:
-        if 'connection' in locals():
-            # noinspection PyUnboundLocalVariable
+        # Failures while cleaning up a broken connection must not hide the original error.
+        if 'cursor' in locals():
+            with contextlib.suppress(mysql.connector.Error):
+                # noinspection PyUnboundLocalVariable
+                cursor.close()
+        # Return the connection to the pool, or close it if it was not pooled.
+        with contextlib.suppress(mysql.connector.Error):
             connection.close()
 
 
+def _rollback(connection):
+    """Roll back the transaction, ignoring errors of an already broken connection."""
+    with contextlib.suppress(mysql.connector.Error):
+        connection.rollback()
+
+
 def check_data_error(data_error):
     """Check if data error is caused by size of inserted data."""
     error_message = str(data_error)
@@ -39,15 +90,35 @@ def check_data_error(data_error):
 
 def custom_sql_connection(host=None, port=3306, user=None, password=None, db_name=None):
     """Return a customized sql_connection context manager."""
+    _get_pool(db_name, host, port, user, password)
     return functools.partial(sql_connection, db_name, host, port, user, password)
 
 
 def clear_tables(active_sql_connection, db_name):
-    """Clear all tables in the database."""
-    with active_sql_connection() as sql:
-        sql.execute("SELECT TABLE_NAME FROM information_schema.tables WHERE TABLE_SCHEMA = %s", (db_name,))
-        for table_name in [row['TABLE_NAME'] for row in sql.fetchall()]:
-            sql.execute("DELETE from {}".format(table_name))
+    """
+    Clear all tables in the database.
+    Unlike drop_tables and get_table_columns, active_sql_connection must accept the dictionary keyword argument
+    of sql_connection, as the partial returned by custom_sql_connection does.
+    """
+    with active_sql_connection(dictionary=False) as sql:
+        # Not a prepared statement: pooled connections reset their session when released,
+        # which deallocates server side prepared statements, so a cached handle would not survive.
+        sql.execute("""
+            SELECT TABLE_NAME FROM information_schema.tables
+            WHERE TABLE_SCHEMA = %s AND TABLE_TYPE = 'BASE TABLE'""", (db_name,))
+        table_names = [row[0] for row in sql]
+        if not table_names:
+            return
+        # TRUNCATE accepts a single table, so send all of them, with foreign key checks toggling, as one query.
+        statements = ["SET FOREIGN_KEY_CHECKS=0"]
+        statements.extend("TRUNCATE TABLE `{}`".format(table_name) for table_name in table_names)
+        statements.append("SET FOREIGN_KEY_CHECKS=1")
+        try:
+            for _ in sql.execute(';'.join(statements), multi=True):
+                pass
+        except mysql.connector.Error:
+            sql.execute("SET FOREIGN_KEY_CHECKS=1")
+            raise
 
 
 def drop_tables(active_sql_connection, db_name):